@@ -127,6 +127,7 @@ EXCLUDED_PORTS: List[int] = []
 # --- Ustawienia Fazy 3 ---
 DIRSEARCH_SMART_FILTER: bool = True
 FEROXBUSTER_SMART_FILTER: bool = True
+MAX_TOOLS_PER_HOST_P3: int = 4  # Równoległe skanery na jeden host
 IGNORED_EXTENSIONS: List[str] = [
     "png",
     "jpg",
@@ -320,6 +321,7 @@ MASSCAN_INTERFACE: Optional[str] = None # np. "tun0" dla HTB
 # --- Ustawienia Fazy 3 ---
 DIRSEARCH_SMART_FILTER: bool = True
 FEROXBUSTER_SMART_FILTER: bool = True
+MAX_TOOLS_PER_HOST_P3: int = 4  # Równoległe skanery na jeden host
 IGNORED_EXTENSIONS: List[str] = [
     "png",
     "jpg",
@@ -1,15 +1,33 @@
 #!/usr/bin/env python3
 
+import functools
 import json
 import os
+import queue
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import uuid
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import urlsplit, urlunsplit
 
 import requests
 import urllib3
@@ -18,17 +36,29 @@ from rich.panel import Panel
 from rich.progress import Progress, TaskID
 from rich.prompt import Prompt
 from rich.table import Table
+from requests.adapters import HTTPAdapter
 from rich.text import Text
 from urllib3.exceptions import InsecureRequestWarning
 
 import config
 import utils
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads  # type: ignore
+
+try:
+    # RE2 gwarantuje czas liniowy (brak backtrackingu) dla wzorców URL
+    import re2 as _re_fast  # type: ignore
+except ImportError:
+    _re_fast = re
+
 urllib3.disable_warnings(InsecureRequestWarning)
 
 # --- Wzorce regularne (fallback dla narzędzi bez JSON) ---
 ansi_escape_pattern = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-DIRSEARCH_RESULT_PATTERN = re.compile(
+_DIRSEARCH_RESULT_RE = (
     r"^\[\d{2}:\d{2}:\d{2}\]\s+"
     r"(\d{3})\s+"
     r"(?:-\s*(\d+)(B|KB|MB)\s*-\s*)?"
@@ -36,7 +66,105 @@ DIRSEARCH_RESULT_PATTERN = re.compile(
     r"(?:\s*->\s*(https?://\S+))?"
     r"(?:.*$|$)"
 )
-GENERIC_URL_PATTERN = re.compile(r"(https?://[^\s/$.?#].[^\s]*)")
+_GENERIC_URL_RE = r"(https?://[^\s/$.?#].[^\s]*)"
+DIRSEARCH_RESULT_PATTERN = _re_fast.compile(_DIRSEARCH_RESULT_RE)
+GENERIC_URL_PATTERN = _re_fast.compile(_GENERIC_URL_RE)
+# Dirsearch + fallback w jednym przebiegu: grupy 1-5 to wynik, grupa 6 to URL
+DIRSEARCH_LINE_PATTERN = _re_fast.compile(
+    f"(?:{_DIRSEARCH_RESULT_RE})|{_GENERIC_URL_RE}"
+)
+MULTI_SLASH_PATTERN = re.compile(r"/{2,}")
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+# Narzędzia, których linie wynikowe zawsze zawierają pełny URL
+_URL_LINE_TOOLS = frozenset({"Dirsearch", "Feroxbuster"})
+
+# (lista z config, zbiór rozszerzeń) - patrz _has_ignored_extension
+_IGNORED_EXT_CACHE: Tuple[Optional[List[str]], FrozenSet[str]] = (None, frozenset())
+
+# Statusy losowej ścieżki oznaczające odpowiedź typu wildcard
+_WILDCARD_STATUSES = frozenset({200, 301, 302, 401, 403})
+
+# Statusy uznawane przez httpx za zweryfikowany URL
+_HTTPX_MATCH_CODES_P3 = "200,201,204,301,302,307,308,401,403,405"
+
+# Rozmiar bloku odczytu stdout narzędzi (read1) i bufora potoku
+_STDOUT_CHUNK_SIZE = 1 << 16
+
+# Znaki URL niedozwolone w nazwach plików raportu
+_FILENAME_TRANS = str.maketrans({"/": "_", ":": "_"})
+
+# --- Współdzielona sesja HTTP (keep-alive dla sond wildcard) ---
+_SESSION = requests.Session()
+_SESSION.verify = False
+_adapter = HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    # Bez ponowień: niedostępny host kosztuje jeden timeout, nie trzy
+    max_retries=0,
+)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+# (ścieżka listy, mtime, katalog raportu) -> potasowana kopia z tej sesji
+_SHUFFLE_CACHE: Dict[Tuple[str, float, str], str] = {}
+
+
+def _sanitize_target_for_filename(target_url: str) -> str:
+    """
+    Zamienia URL celu na fragment nazwy pliku (bez schematu, '/' i ':' -> '_').
+    """
+    if target_url.startswith("https://"):
+        target_url = target_url[8:]
+    elif target_url.startswith("http://"):
+        target_url = target_url[7:]
+    return target_url.translate(_FILENAME_TRANS)
+
+
+def _host_base_url(url: str) -> str:
+    """
+    Zwraca scheme://host[:port] dla URL (bez schematu zakłada https://).
+    """
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _canonicalize_url(url: str) -> str:
+    """
+    Sprowadza URL do postaci kanonicznej, aby równoważne adresy z różnych
+    narzędzi trafiały do zbioru raz: małe litery w schemacie i hoście,
+    bez domyślnego portu, bez '//' w ścieżce, bez końcowego '/' i fragmentu.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url.rstrip("/")
+
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    default_port = _DEFAULT_PORTS.get(scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[: -len(default_port)]
+    path = MULTI_SLASH_PATTERN.sub("/", parts.path).rstrip("/")
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+def _has_ignored_extension(url: str) -> bool:
+    """
+    Sprawdza, czy URL kończy się rozszerzeniem z config.IGNORED_EXTENSIONS.
+    Zbiór rozszerzeń jest przebudowywany tylko po zmianie listy w ustawieniach.
+    """
+    global _IGNORED_EXT_CACHE
+    source, ignored = _IGNORED_EXT_CACHE
+    if source is not config.IGNORED_EXTENSIONS:
+        ignored = frozenset(ext.lower() for ext in config.IGNORED_EXTENSIONS)
+        _IGNORED_EXT_CACHE = (config.IGNORED_EXTENSIONS, ignored)
+
+    path_part = url.split("?", 1)[0].split("#", 1)[0]
+    _, dot, extension = path_part.rpartition(".")
+    return bool(dot) and extension.lower() in ignored
 
 
 def _parse_json_output_file(
@@ -53,53 +181,52 @@ def _parse_json_output_file(
 
     try:
         with open(json_file_path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read().strip()
-
-        if not content:
-            return []
-
-        if tool_name == "Ffuf":
-            # ffuf JSON format: {"results": [{"url": "...", "status": 200, ...}, ...]}
-            data = json.loads(content)
-            for result in data.get("results", []):
-                url = result.get("url", "")
-                if url:
-                    results.add(url.strip().rstrip("/"))
-
-        elif tool_name == "Gobuster":
-            # gobuster JSON format: JSONL (jedna linia = jeden obiekt)
-            # {"status": 200, "url": "http://...", "path": "/admin", ...}
-            for line in content.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                    # Gobuster może zwracać 'url' lub trzeba złożyć z 'path'
-                    url = obj.get("url", "")
-                    if not url and obj.get("path"):
-                        path = obj["path"]
-                        url = f"{base_url.rstrip('/')}{path if path.startswith('/') else '/' + path}"
+            if tool_name == "Ffuf":
+                # ffuf JSON format: {"results": [{"url": "...", "status": 200, ...}, ...]}
+                content = f.read().strip()
+                if not content:
+                    return []
+                data = json.loads(content)
+                for result in data.get("results", []):
+                    url = result.get("url", "")
                     if url:
-                        results.add(url.strip().rstrip("/"))
-                except json.JSONDecodeError:
-                    continue
+                        results.add(_canonicalize_url(url))
 
-        elif tool_name == "Feroxbuster":
-            # feroxbuster JSON format: JSONL
-            # {"type": "response", "url": "http://...", "status": 200, ...}
-            for line in content.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                    if obj.get("type") == "response":
+            elif tool_name == "Gobuster":
+                # gobuster JSON format: JSONL (jedna linia = jeden obiekt),
+                # czytany strumieniowo linia po linii
+                # {"status": 200, "url": "http://...", "path": "/admin", ...}
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                        # Gobuster może zwracać 'url' lub trzeba złożyć z 'path'
                         url = obj.get("url", "")
+                        if not url and obj.get("path"):
+                            path = obj["path"]
+                            url = f"{base_url.rstrip('/')}{path if path.startswith('/') else '/' + path}"
                         if url:
-                            results.add(url.strip().rstrip("/"))
-                except json.JSONDecodeError:
-                    continue
+                            results.add(_canonicalize_url(url))
+                    except json.JSONDecodeError:
+                        continue
+
+            elif tool_name == "Feroxbuster":
+                # feroxbuster JSON format: JSONL, czytany strumieniowo
+                # {"type": "response", "url": "http://...", "status": 200, ...}
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                        if obj.get("type") == "response":
+                            url = obj.get("url", "")
+                            if url:
+                                results.add(_canonicalize_url(url))
+                    except json.JSONDecodeError:
+                        continue
 
     except json.JSONDecodeError as e:
         utils.log_and_echo(f"Błąd parsowania JSON dla {tool_name}: {e}", "WARN")
@@ -107,19 +234,36 @@ def _parse_json_output_file(
         utils.log_and_echo(f"Błąd odczytu pliku JSON {tool_name}: {e}", "ERROR")
 
     # Filtrowanie ignorowanych rozszerzeń
-    filtered_results = []
-    for url in results:
-        try:
-            path_part = url.split("?")[0].split("#")[0]
-            if "." in path_part:
-                extension = path_part.split(".")[-1].lower()
-                if extension in config.IGNORED_EXTENSIONS:
-                    continue
-        except Exception:
-            pass
-        filtered_results.append(url)
+    return [url for url in results if not _has_ignored_extension(url)]
+
 
-    return filtered_results
+def _get_shuffled_wordlist(wordlist: str) -> Optional[str]:
+    """
+    Zwraca potasowaną kopię listy słów, tworząc ją tylko raz na sesję
+    (dopóki plik źródłowy się nie zmieni i kopia wciąż istnieje).
+    """
+    try:
+        key = (wordlist, os.path.getmtime(wordlist), config.REPORT_DIR)
+    except OSError:
+        return utils.shuffle_wordlist(wordlist, config.REPORT_DIR)
+
+    cached_path = _SHUFFLE_CACHE.get(key)
+    if cached_path and os.path.exists(cached_path):
+        return cached_path
+
+    shuffled_path = utils.shuffle_wordlist(wordlist, config.REPORT_DIR)
+    if shuffled_path:
+        _SHUFFLE_CACHE[key] = shuffled_path
+        config.TEMP_FILES_TO_CLEAN.append(shuffled_path)
+    return shuffled_path
+
+
+@functools.lru_cache(maxsize=None)
+def _wordlist_exists(path: str) -> bool:
+    """
+    Sprawdza istnienie listy słów - wynik zapamiętywany na czas działania.
+    """
+    return os.path.exists(path)
 
 
 def _select_wordlist_based_on_tech(
@@ -139,7 +283,7 @@ def _select_wordlist_based_on_tech(
 
         if tech_lower in config.TECH_SPECIFIC_WORDLISTS:
             wordlist_path = config.TECH_SPECIFIC_WORDLISTS[tech_lower]
-            if os.path.exists(wordlist_path):
+            if _wordlist_exists(wordlist_path):
                 file_name = os.path.basename(wordlist_path)
 
                 question = (
@@ -178,39 +322,38 @@ def _select_wordlist_based_on_tech(
 
 def _detect_wildcard_response(target_url: str) -> Dict[str, Any]:
     wildcard_params: Dict[str, Any] = {}
-    random_path = f"{uuid.uuid4().hex[:8]}-{uuid.uuid4().hex[:8]}"
+    random_path = os.urandom(8).hex()
     test_url = f"{target_url.rstrip('/')}/{random_path}"
 
     try:
-        session = requests.Session()
-        headers_list = utils.get_random_browser_headers()
-        headers = {h.split(": ")[0]: h.split(": ")[1] for h in headers_list}
+        headers = utils.get_random_browser_header_dict()
 
         # ZMIANA: Użycie globalnego UA (rotator lub custom)
         headers["User-Agent"] = utils.user_agent_rotator.get()
 
-        response = session.get(
+        # stream=True: ciało przekierowania nie jest pobierane, gdy i tak
+        # podążamy za Location; rozmiar liczymy tylko z odpowiedzi końcowej.
+        response = _SESSION.get(
             test_url,
             headers=headers,
-            verify=False,
             timeout=15,
             allow_redirects=False,
+            stream=True,
         )
 
         if response.is_redirect:
             final_url = response.headers.get("Location")
             if final_url:
+                response.close()
                 if final_url.startswith("/"):
-                    base_url = "/".join(target_url.split("/")[:3])
+                    base_url = _host_base_url(target_url)
                     final_url = f"{base_url}{final_url}"
-                response = session.get(
-                    final_url, headers=headers, verify=False, timeout=15
-                )
+                response = _SESSION.get(final_url, headers=headers, timeout=15)
 
         status_code = response.status_code
         content_length = len(response.content)
 
-        if status_code in [200, 301, 302, 401, 403]:
+        if status_code in _WILDCARD_STATUSES:
             wildcard_params["status"] = status_code
             wildcard_params["size"] = content_length
             msg = (
@@ -218,6 +361,23 @@ def _detect_wildcard_response(target_url: str) -> Dict[str, Any]:
                 f"Status={status_code}, Rozmiar={content_length}"
             )
             utils.log_and_echo(msg, "DEBUG")
+
+            if status_code == 200:
+                # Druga sonda (inna długość ścieżki) potwierdza catch-all 200
+                confirm_url = f"{target_url.rstrip('/')}/{os.urandom(16).hex()}"
+                confirm = _SESSION.get(
+                    confirm_url, headers=headers, timeout=15, allow_redirects=False
+                )
+                if (
+                    confirm.status_code == 200
+                    and abs(len(confirm.content) - content_length) < 32
+                ):
+                    wildcard_params["poison"] = True
+                    msg = (
+                        f"{target_url} zwraca 200 o stałym rozmiarze dla "
+                        f"dowolnej ścieżki - bruteforce katalogów nie ma sensu."
+                    )
+                    utils.log_and_echo(msg, "WARN")
         else:
             msg = f"Brak wildcard dla {target_url} (Status: {status_code})."
             utils.log_and_echo(msg, "DEBUG")
@@ -229,54 +389,163 @@ def _detect_wildcard_response(target_url: str) -> Dict[str, Any]:
     return wildcard_params
 
 
+def _detect_wildcard_for_hosts(hosts: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Równolegle wykrywa odpowiedzi wildcard - jedna sonda na scheme://host,
+    wspólna dla wszystkich URLi tego hosta.
+    """
+    wildcard_by_host: Dict[str, Dict[str, Any]] = {}
+    if not hosts:
+        return wildcard_by_host
+
+    with ThreadPoolExecutor(max_workers=min(32, len(hosts))) as probe_pool:
+        probe_futures = {
+            probe_pool.submit(_detect_wildcard_response, host): host for host in hosts
+        }
+        for probe_future in as_completed(probe_futures):
+            wildcard_by_host[probe_futures[probe_future]] = probe_future.result()
+    return wildcard_by_host
+
+
+def _parse_feroxbuster_line(
+    cleaned_line: str, base_url: Optional[str]
+) -> Optional[str]:
+    # Wiersz wyniku Feroxbustera zaczyna się od kodu statusu - inne linie
+    # idą od razu do ogólnego wzorca URL (bez dzielenia na kolumny).
+    if not cleaned_line[0].isdigit():
+        return None
+    parts = cleaned_line.split()
+    if (
+        len(parts) >= 6
+        and parts[0].isdigit()
+        and parts[2].endswith("l")
+        and parts[4].endswith("c")
+    ):
+        url = parts[-1]
+        if url.startswith("http"):
+            return url
+    return None
+
+
+def _parse_dirsearch_line(cleaned_line: str, base_url: Optional[str]) -> Optional[str]:
+    if "://" not in cleaned_line:
+        return None
+    # Szybka ścieżka: "[hh:mm:ss] 200 - 1KB - URL [-> URL]" rozbijamy split(),
+    # ostatni token URL to cel przekierowania albo sam wynik.
+    if cleaned_line[0] == "[":
+        parts = cleaned_line.split()
+        if len(parts) >= 3 and len(parts[1]) == 3 and parts[1].isdigit():
+            for token in reversed(parts):
+                if token.startswith(("http://", "https://")):
+                    return token
+    match = DIRSEARCH_LINE_PATTERN.search(cleaned_line)
+    if not match:
+        return None
+    return match.group(5) or match.group(4) or match.group(6)
+
+
+def _parse_path_line(cleaned_line: str, base_url: Optional[str]) -> Optional[str]:
+    # Ffuf/Gobuster wypisują ścieżkę względną - doklejamy ją do base_url
+    path = cleaned_line.split()[0]
+    if base_url and not path.isdigit() and not path.startswith("http"):
+        separator = "" if path.startswith("/") else "/"
+        return f"{base_url.rstrip('/')}{separator}{path}"
+    return None
+
+
+_LineParser = Callable[[str, Optional[str]], Optional[str]]
+
+_LINE_PARSERS: Dict[str, _LineParser] = {
+    "Feroxbuster": _parse_feroxbuster_line,
+    "Dirsearch": _parse_dirsearch_line,
+    "Ffuf": _parse_path_line,
+    "Gobuster": _parse_path_line,
+}
+
+
 def _parse_tool_output_line(
-    line: str, tool_name: str, base_url: Optional[str] = None
+    line: str,
+    tool_name: str,
+    base_url: Optional[str] = None,
+    parser: Optional[_LineParser] = None,
 ) -> Optional[str]:
-    cleaned_line = ansi_escape_pattern.sub("", line).strip()
+    """
+    Wyciąga URL z linii wyjścia narzędzia. Parser specyficzny dla narzędzia
+    można przekazać z góry, aby pominąć wyszukiwanie w _LINE_PARSERS.
+    """
+    if not line or line.isspace():
+        return None
+    # Tanie filtry literałowe przed regexami: ANSI tylko gdy jest ESC,
+    # a wzorce URL wymagają "://" w linii.
+    if "\x1b" in line:
+        line = ansi_escape_pattern.sub("", line)
+    cleaned_line = line.strip()
     if not cleaned_line or ":: Progress:" in cleaned_line or "Target: " in cleaned_line:
         return None
 
-    full_url = None
-    if tool_name == "Feroxbuster":
-        parts = cleaned_line.split()
-        if (
-            len(parts) >= 6
-            and parts[0].isdigit()
-            and parts[2].endswith("l")
-            and parts[4].endswith("c")
-        ):
-            url = parts[-1]
-            if url.startswith("http"):
-                full_url = url
-    elif tool_name == "Dirsearch":
-        match = DIRSEARCH_RESULT_PATTERN.match(cleaned_line)
-        if match:
-            full_url = match.group(5) or match.group(4)
-    elif tool_name in ["Ffuf", "Gobuster"]:
-        parts = cleaned_line.split()
-        path = parts[0].strip()
-        if base_url and not path.isdigit() and not path.startswith("http"):
-            full_url = (
-                f"{base_url.rstrip('/')}"
-                f"{'/' if not path.startswith('/') else ''}{path}"
-            )
+    if parser is None:
+        parser = _LINE_PARSERS.get(tool_name)
+    full_url = parser(cleaned_line, base_url) if parser else None
+    if parser is _parse_dirsearch_line and not full_url:
+        # Wzorzec Dirsearch zawiera już ogólny wzorzec URL
+        return None
 
-    if not full_url:
+    if not full_url and "://" in cleaned_line:
         generic_match = GENERIC_URL_PATTERN.search(cleaned_line)
         if generic_match:
             full_url = generic_match.group(1)
 
-    if full_url:
-        try:
-            path_part = full_url.split("?")[0].split("#")[0]
-            if "." in path_part:
-                extension = path_part.split(".")[-1].lower()
-                if extension in config.IGNORED_EXTENSIONS:
-                    return None
-        except Exception:
-            pass
+    if full_url and _has_ignored_extension(full_url):
+        return None
 
-    return full_url.strip().rstrip("/") if full_url else None
+    return _canonicalize_url(full_url) if full_url else None
+
+
+def _fast_extract_httpx_fields(raw_line: bytes) -> Optional[Tuple[str, int]]:
+    """
+    Szybko wyciąga "url" i "status_code" z linii JSON httpx bez budowania
+    pełnego słownika. Zwraca None, gdy linia wymaga pełnego parsera
+    (brak pól, sekwencje ucieczki itp.).
+    """
+    url_start = raw_line.find(b'"url":"')
+    if url_start == -1:
+        return None
+    url_start += 7
+    url_end = raw_line.find(b'"', url_start)
+    if url_end == -1:
+        return None
+    url_bytes = raw_line[url_start:url_end]
+    # Go escapuje m.in. '&' jako \u0026 - takie wartości oddajemy parserowi JSON
+    if b"\\" in url_bytes:
+        return None
+
+    sc_start = raw_line.find(b'"status_code":')
+    if sc_start == -1:
+        return None
+    sc_start += 14
+    sc_end = sc_start
+    while sc_end < len(raw_line) and 48 <= raw_line[sc_end] <= 57:
+        sc_end += 1
+    if sc_end == sc_start or not url_bytes:
+        return None
+    try:
+        return url_bytes.decode("utf-8"), int(raw_line[sc_start:sc_end])
+    except UnicodeDecodeError:
+        return None
+
+
+def _iter_output_lines(stream: BinaryIO, sink: BinaryIO) -> Iterator[bytes]:
+    """
+    Czyta stdout narzędzia blokami (read1) zamiast linia po linii. Każdy blok
+    trafia w całości do pliku surowego, a parser dostaje pełne linie.
+    """
+    tail = b""
+    while chunk := stream.read1(_STDOUT_CHUNK_SIZE):  # type: ignore[attr-defined]
+        sink.write(chunk)
+        *lines, tail = (tail + chunk).split(b"\n")
+        yield from lines
+    if tail:
+        yield tail
 
 
 def _run_and_parse_dir_tool(
@@ -297,47 +566,81 @@ def _run_and_parse_dir_tool(
         f"[dim white]{cmd_str}[/dim white]"
     )
 
-    try:
-        process = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            encoding="utf-8",
-            errors="ignore",
-        )
+    line_results: Set[str] = set()
+    timed_out = threading.Event()
+    # Linie bez "://" odrzucamy na bajtach - bez dekodowania i parsowania
+    url_lines_only = tool_name in _URL_LINE_TOOLS
+    line_parser = _LINE_PARSERS.get(tool_name)
 
+    try:
         phase3_dir = os.path.join(config.REPORT_DIR, "faza3_dirsearch")
-        sanitized_target = re.sub(r"https?://", "", target_url).replace("/", "_")
-        sanitized_target = sanitized_target.replace(":", "_")
+        sanitized_target = _sanitize_target_for_filename(target_url)
         raw_output_file = os.path.join(
             phase3_dir, f"{tool_name.lower()}_{sanitized_target}.txt"
         )
 
-        with open(raw_output_file, "w", encoding="utf-8") as f:
-            f.write(f"--- Raw output for {tool_name} on {target_url} ---\n\n")
-            f.write(process.stdout)
-            if process.stderr:
-                f.write("\n\n--- STDERR ---\n\n")
-                f.write(process.stderr)
+        # Strumieniowo: stdout trafia do pliku i parsera linia po linii,
+        # stderr do pliku tymczasowego (brak ryzyka zapchania potoku).
+        # Surowe bajty zapisujemy bez kodowania, dekodujemy tylko do parsera.
+        with open(
+            raw_output_file, "wb", buffering=1 << 20
+        ) as f, tempfile.TemporaryFile() as stderr_f:
+            f.write(f"--- Raw output for {tool_name} on {target_url} ---\n\n".encode())
+            with subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=stderr_f,
+                bufsize=_STDOUT_CHUNK_SIZE,
+                env={**os.environ, "NO_COLOR": "1"},
+            ) as process:
+                # Bez osobnej sesji: Ctrl+C trafia do skanera razem z grupą
+                # procesów shadowmap, a timeout zabija sam proces narzędzia.
+
+                def _kill_on_timeout():
+                    timed_out.set()
+                    process.kill()
+
+                timer = threading.Timer(timeout, _kill_on_timeout)
+                timer.start()
+                try:
+                    for raw_line in _iter_output_lines(
+                        process.stdout, f  # type: ignore[arg-type]
+                    ):
+                        if url_lines_only and b"://" not in raw_line:
+                            continue
+                        parsed_url = _parse_tool_output_line(
+                            raw_line.decode("utf-8", errors="ignore"),
+                            tool_name,
+                            base_url=target_url,
+                            parser=line_parser,
+                        )
+                        if parsed_url:
+                            line_results.add(sys.intern(parsed_url))
+                    process.wait()
+                finally:
+                    timer.cancel()
+
+            if stderr_f.tell():
+                stderr_f.seek(0)
+                f.write(b"\n\n--- STDERR ---\n\n")
+                shutil.copyfileobj(stderr_f, f)
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(command, timeout)
 
         # Preferuj parsowanie JSON jeśli plik istnieje
         if json_output_file and os.path.exists(json_output_file):
             json_results = _parse_json_output_file(
                 json_output_file, tool_name, target_url
             )
-            results.update(json_results)
+            # Internowane URL-e: scalanie wyników narzędzi porównuje wskaźniki
+            results.update(map(sys.intern, json_results))
             utils.log_and_echo(
                 f"{tool_name}: Sparsowano {len(json_results)} wyników z JSON", "DEBUG"
             )
         else:
             # Fallback do parsowania regex (dla Dirsearch lub gdy brak JSON)
-            for line in process.stdout.splitlines():
-                parsed_url = _parse_tool_output_line(
-                    line, tool_name, base_url=target_url
-                )
-                if parsed_url:
-                    results.add(parsed_url)
+            results.update(line_results)
 
         if process.returncode == 0:
             msg = f"✅ {tool_name} zakończył. Znaleziono {len(results)} URLi."
@@ -352,12 +655,189 @@ def _run_and_parse_dir_tool(
     except Exception as e:
         utils.log_and_echo(f"Błąd wykonania {tool_name}: {e}", "ERROR")
 
-    return tool_name, sorted(list(results))
+    return tool_name, sorted(results)
+
+
+def _build_tool_template(
+    tool_name: str, base_cmd: List[str], wordlist: str, threads: str
+) -> List[str]:
+    """
+    Buduje część komendy narzędzia niezależną od URL: lista słów, wątki,
+    rekursja, opóźnienia Safe Mode i stałe filtry.
+    """
+    cmd = list(base_cmd)
+    depth = config.RECURSION_DEPTH_P3
+
+    if tool_name == "Ffuf":
+        cmd += ["-w", f"{wordlist}:FUZZ", "-t", threads, "-of", "json"]
+        if depth > 0:
+            cmd += ["-recursion", "-recursion-depth", str(depth)]
+        if config.SAFE_MODE:
+            cmd += ["-p", "0.5-2.5"]
+
+    elif tool_name == "Feroxbuster":
+        cmd += ["-w", wordlist, "-t", threads, "--json"]
+        if depth > 0:
+            cmd += ["--depth", str(depth)]
+        else:
+            cmd.append("--no-recursion")
+        if not config.FEROXBUSTER_SMART_FILTER:
+            cmd.append("--dont-filter")
+
+    elif tool_name == "Dirsearch":
+        cmd += ["-w", wordlist, "-t", threads]
+        if depth > 0:
+            cmd += ["-r", "--max-recursion-depth", str(depth)]
+        if config.SAFE_MODE:
+            cmd += ["--delay", "1-2.5"]
+        if not config.DIRSEARCH_SMART_FILTER:
+            cmd.append("--exclude-sizes=0B")
+
+    elif tool_name == "Gobuster":
+        cmd += ["-w", wordlist, "-t", threads, "-k", "--no-error"]
+        if config.SAFE_MODE:
+            cmd += ["--delay", "1500ms"]
+
+    return cmd
 
 
-def _handle_waf_block_detection(
-    executor: ThreadPoolExecutor, futures: Dict[Future, str]
-):
+def _ffuf_url_cmd(
+    tpl: List[str],
+    url: str,
+    wildcard: Dict[str, Any],
+    ua: str,
+    json_output_file: Optional[str],
+) -> List[str]:
+    cmd = tpl + [
+        "-o",
+        str(json_output_file),
+        "-H",
+        f"User-Agent: {ua}",
+        "-u",
+        f"{url}/FUZZ",
+    ]
+    if wc_size := wildcard.get("size"):
+        cmd += ["-fs", str(wc_size)]
+    if wc_status := wildcard.get("status"):
+        cmd += ["-fc", str(wc_status)]
+    return cmd
+
+
+def _feroxbuster_url_cmd(
+    tpl: List[str],
+    url: str,
+    wildcard: Dict[str, Any],
+    ua: str,
+    json_output_file: Optional[str],
+) -> List[str]:
+    cmd = tpl + ["-u", url, "--output", str(json_output_file), "-a", ua]
+    if config.FEROXBUSTER_SMART_FILTER and (wc_size := wildcard.get("size")):
+        cmd += ["-S", str(wc_size)]
+    return cmd
+
+
+def _dirsearch_url_cmd(
+    tpl: List[str],
+    url: str,
+    wildcard: Dict[str, Any],
+    ua: str,
+    json_output_file: Optional[str],
+) -> List[str]:
+    # Dirsearch - używamy regex fallback (brak natywnego JSON CLI)
+    cmd = tpl + ["-u", url, "-H", f"User-Agent: {ua}"]
+    if config.DIRSEARCH_SMART_FILTER and (wc_status := wildcard.get("status")):
+        if wc_status != 200:
+            cmd += ["--exclude-status", str(wc_status)]
+        if wc_size := wildcard.get("size"):
+            cmd += ["--exclude-lengths", str(wc_size)]
+    return cmd
+
+
+def _gobuster_url_cmd(
+    tpl: List[str],
+    url: str,
+    wildcard: Dict[str, Any],
+    ua: str,
+    json_output_file: Optional[str],
+) -> List[str]:
+    # Gobuster dir mode: parsujemy wyniki z pliku
+    cmd = tpl + ["-u", url, "-o", str(json_output_file), "-a", ua]
+    wc_status = wildcard.get("status")
+    if wc_status and wc_status != 404:
+        cmd += ["-b", str(wc_status)]
+    return cmd
+
+
+# Flagi zależne od URL (wyjście, UA, -u, filtry wildcard) dla każdego narzędzia
+_URL_CMD_BUILDERS: Dict[str, Callable[..., List[str]]] = {
+    "Ffuf": _ffuf_url_cmd,
+    "Feroxbuster": _feroxbuster_url_cmd,
+    "Dirsearch": _dirsearch_url_cmd,
+    "Gobuster": _gobuster_url_cmd,
+}
+
+
+class _HostJobScheduler:
+    """
+    Limit skanerów na host egzekwowany przy zlecaniu zadań: w puli jest
+    najwyżej `limit` zadań danego hosta, a kolejne trafia do niej dopiero
+    po odebraniu wyniku poprzedniego. Wątki puli nigdy nie czekają na host,
+    więc pozostałe hosty dostają wolne wątki od razu.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, limit: int):
+        self._executor = executor
+        self._limit = max(1, limit)
+        self._pending: Dict[str, Deque[Tuple[str, Tuple[Any, ...]]]] = {}
+        self._in_flight = 0
+        self._done: "queue.Queue[Tuple[str, str, Future]]" = queue.Queue()
+
+    def add(self, host: str, tag: str, *args: Any) -> None:
+        """
+        Kolejkuje wywołanie _run_and_parse_dir_tool(*args) dla hosta.
+        """
+        self._pending.setdefault(host, deque()).append((tag, args))
+
+    def completed(self) -> Iterator[Tuple[str, Future]]:
+        """
+        Zleca zadania i zwraca (tag, future) w kolejności zakończenia.
+        Zadania zleca wyłącznie wątek konsumenta - callbacki tylko kolejkują
+        wynik, bo shutdown(cancel_futures=True) woła je pod blokadą puli.
+        """
+        # Rundami po hostach - pierwsze zadania każdego hosta są na początku
+        for _ in range(self._limit):
+            for host in list(self._pending):
+                self._submit_next(host)
+        while self._in_flight:
+            host, tag, future = self._done.get()
+            self._in_flight -= 1
+            self._submit_next(host)
+            yield tag, future
+
+    def _submit_next(self, host: str) -> None:
+        jobs = self._pending.get(host)
+        if not jobs:
+            return
+        tag, args = jobs.popleft()
+        try:
+            future = self._executor.submit(_run_and_parse_dir_tool, *args)
+        except RuntimeError:
+            # Pula zamknięta (blokada WAF) - pozostałe zadania nie ruszą, ale
+            # zwracamy je jako anulowane, aby pasek postępu doszedł do końca
+            jobs.appendleft((tag, args))
+            for dropped_host, dropped_jobs in self._pending.items():
+                for dropped_tag, _ in dropped_jobs:
+                    placeholder: Future = Future()
+                    placeholder.cancel()
+                    self._done.put((dropped_host, dropped_tag, placeholder))
+                    self._in_flight += 1
+            self._pending.clear()
+            return
+        self._in_flight += 1
+        future.add_done_callback(lambda f, h=host, t=tag: self._done.put((h, t, f)))
+
+
+def _handle_waf_block_detection(executor: ThreadPoolExecutor):
     """Obsługuje interakcję z użytkownikiem po wykryciu blokady WAF."""
     panel_text = (
         "[bold red]WYKRYTO BLOKADĘ WAF/IPS![/bold red]\n"
@@ -372,8 +852,7 @@ def _handle_waf_block_detection(
         )
     )
 
-    for future in futures:
-        future.cancel()
+    # cancel_futures anuluje wszystkie oczekujące zadania naraz
     executor.shutdown(wait=False, cancel_futures=True)
 
     choice = Prompt.ask(
@@ -393,11 +872,12 @@ def start_dir_search(
     progress_obj: Optional[Progress] = None,
     main_task_id: Optional[TaskID] = None,
 ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
-    results_by_tool: Dict[str, List[str]] = {
-        "Ffuf": [],
-        "Feroxbuster": [],
-        "Dirsearch": [],
-        "Gobuster": [],
+    # Zbiory w trakcie skanu (deduplikacja), listy dopiero w wyniku końcowym
+    results_by_tool: Dict[str, Set[str]] = {
+        "Ffuf": set(),
+        "Feroxbuster": set(),
+        "Dirsearch": set(),
+        "Gobuster": set(),
     }
 
     if config.USER_CUSTOMIZED_WORDLIST_PHASE3:
@@ -410,34 +890,41 @@ def start_dir_search(
     if config.SAFE_MODE:
         if wordlist == config.DEFAULT_WORDLIST_PHASE3:
             wordlist = config.SMALL_WORDLIST_PHASE3
-        shuffled_path = utils.shuffle_wordlist(wordlist, config.REPORT_DIR)
+        shuffled_path = _get_shuffled_wordlist(wordlist)
         if shuffled_path:
             wordlist = shuffled_path
-            config.TEMP_FILES_TO_CLEAN.append(shuffled_path)
 
+    # Wyjście bez kolorów i pasków postępu - parser nie musi czyścić ANSI
     tool_configs: List[Dict[str, Any]] = [
         {
             "name": "Ffuf",
             "enabled": config.selected_phase3_tools[0],
-            "base_cmd": ["ffuf"],
+            "base_cmd": ["ffuf", "-noninteractive"],
+            "json_output": True,
         },
         {
             "name": "Feroxbuster",
             "enabled": config.selected_phase3_tools[1],
-            "base_cmd": ["feroxbuster", "--no-state"],
+            "base_cmd": ["feroxbuster", "--no-state", "--quiet"],
+            "json_output": True,
         },
         {
             "name": "Dirsearch",
             "enabled": config.selected_phase3_tools[2],
-            "base_cmd": ["dirsearch", "--full-url"],
+            "base_cmd": ["dirsearch", "--full-url", "--no-color"],
+            "json_output": False,
         },
         {
             "name": "Gobuster",
             "enabled": config.selected_phase3_tools[3],
-            "base_cmd": ["gobuster", "dir", "--no-progress"],
+            "base_cmd": ["gobuster", "dir", "--no-progress", "--no-color"],
+            "json_output": True,
         },
     ]
 
+    host_of: Dict[str, str] = {url: _host_base_url(url) for url in urls}
+    unique_hosts = sorted(set(host_of.values()))
+
     waf_monitors: Dict[str, Optional[utils.WafHealthMonitor]] = {}
     if config.WAF_CHECK_ENABLED:
         min_i, max_i = (
@@ -453,159 +940,97 @@ def start_dir_search(
         )
         msg = f"Monitor WAF aktywny (interwał: {min_i}-{max_i}s)"
         utils.log_and_echo(msg, "INFO")
-        unique_hosts = {"/".join(url.split("/")[:3]) for url in urls}
         for host in unique_hosts:
-            new_monitor = utils.WafHealthMonitor(
+            waf_monitors[host] = utils.WafHealthMonitor(
                 host, interval_min=min_i, interval_max=max_i
             )
-            new_monitor.start()
-            waf_monitors[host] = new_monitor
+        # Baseline każdego monitora to osobne żądanie - startujemy równolegle
+        if unique_hosts:
+            with ThreadPoolExecutor(
+                max_workers=min(16, len(unique_hosts))
+            ) as start_pool:
+                list(start_pool.map(lambda m: m.start(), waf_monitors.values()))
 
     try:
+        # Sondy wildcard lecą równolegle zanim ruszą narzędzia
+        wildcard_by_host = _detect_wildcard_for_hosts(unique_hosts)
+
+        # Część komend niezależna od URL - budowana raz na uruchomienie
+        threads = "1" if config.SAFE_MODE else str(config.THREADS)
+        enabled_configs = [cfg for cfg in tool_configs if cfg["enabled"]]
+        for cfg in enabled_configs:
+            cfg["tpl"] = _build_tool_template(
+                cfg["name"], cfg["base_cmd"], wordlist, threads
+            )
+
+        # Wartości stałe w trakcie przebiegu - lokalnie zamiast config.* w pętli
+        tool_timeout = config.TOOL_TIMEOUT_SECONDS
+        user_agent_rotator = utils.user_agent_rotator
         with ThreadPoolExecutor(max_workers=config.THREADS) as executor:
-            futures_map: Dict[Future, str] = {}
+            scheduler = _HostJobScheduler(executor, config.MAX_TOOLS_PER_HOST_P3)
+            phase3_dir = os.path.join(config.REPORT_DIR, "faza3_dirsearch")
             for url in urls:
                 v_url = url
                 if not url.startswith(("http://", "https://")):
                     v_url = f"https://{url}"
-                wildcard = _detect_wildcard_response(v_url)
-
-                for cfg in tool_configs:
-                    if not cfg["enabled"]:
-                        continue
-                    cmd = list(cfg["base_cmd"])
-                    threads = "1" if config.SAFE_MODE else str(config.THREADS)
-                    json_output_file = None  # Plik JSON dla narzędzi wspierających
-
-                    # ZMIANA: Pobranie globalnego UA (może być custom)
-                    current_ua = utils.user_agent_rotator.get()
-
-                    # Przygotowanie ścieżki do pliku JSON
-                    phase3_dir = os.path.join(config.REPORT_DIR, "faza3_dirsearch")
-                    sanitized_target = (
-                        re.sub(r"https?://", "", v_url)
-                        .replace("/", "_")
-                        .replace(":", "_")
+                wildcard_host = host_of[url]
+                wildcard = wildcard_by_host[wildcard_host]
+                if wildcard.get("poison"):
+                    utils.console.print(
+                        f"[yellow]Pomijam {v_url}: wildcard 200 dla każdej ścieżki[/yellow]"
                     )
-
-                    if cfg["name"] == "Ffuf":
-                        # ENTERPRISE: JSON output dla precyzyjnego parsowania
-                        json_output_file = os.path.join(
-                            phase3_dir,
-                            f"ffuf_{sanitized_target}_{uuid.uuid4().hex[:8]}.json",
+                    if progress_obj and main_task_id is not None:
+                        progress_obj.update(
+                            main_task_id,
+                            advance=len(enabled_configs),
                         )
-                        cmd.extend(["-w", f"{wordlist}:FUZZ", "-t", threads])
-                        cmd.extend(
-                            ["-o", json_output_file, "-of", "json"]
-                        )  # JSON output
-                        if config.RECURSION_DEPTH_P3 > 0:
-                            cmd.extend(
-                                [
-                                    "-recursion",
-                                    "-recursion-depth",
-                                    str(config.RECURSION_DEPTH_P3),
-                                ]
-                            )
-                        if config.SAFE_MODE:
-                            cmd.extend(["-p", "0.5-2.5"])
-
-                        cmd.extend(["-H", f"User-Agent: {current_ua}"])
-
-                        if wc_size := wildcard.get("size"):
-                            cmd.extend(["-fs", str(wc_size)])
-                        if wc_status := wildcard.get("status"):
-                            cmd.extend(["-fc", str(wc_status)])
-                        cmd.extend(["-u", f"{v_url}/FUZZ"])
-
-                    elif cfg["name"] == "Feroxbuster":
-                        # ENTERPRISE: JSON output dla precyzyjnego parsowania
-                        json_output_file = os.path.join(
-                            phase3_dir,
-                            f"feroxbuster_{sanitized_target}_{uuid.uuid4().hex[:8]}.json",
-                        )
-                        cmd.extend(["-w", wordlist, "-t", threads, "-u", v_url])
-                        cmd.extend(
-                            ["--output", json_output_file, "--json"]
-                        )  # JSON output
-                        if config.RECURSION_DEPTH_P3 > 0:
-                            cmd.extend(["--depth", str(config.RECURSION_DEPTH_P3)])
-                        else:
-                            cmd.append("--no-recursion")
-
-                        cmd.extend(["-a", current_ua])
-
-                        if not config.FEROXBUSTER_SMART_FILTER:
-                            cmd.append("--dont-filter")
-                        elif wc_size := wildcard.get("size"):
-                            cmd.extend(["-S", str(wc_size)])
-
-                    elif cfg["name"] == "Dirsearch":
-                        # Dirsearch - używamy regex fallback (brak natywnego JSON CLI)
-                        cmd.extend(["-w", wordlist, "-t", threads, "-u", v_url])
-                        if config.RECURSION_DEPTH_P3 > 0:
-                            cmd.extend(
-                                [
-                                    "-r",
-                                    "--max-recursion-depth",
-                                    str(config.RECURSION_DEPTH_P3),
-                                ]
-                            )
-                        if config.SAFE_MODE:
-                            cmd.extend(["--delay", "1-2.5"])
-
-                        cmd.extend(["-H", f"User-Agent: {current_ua}"])
-
-                        if not config.DIRSEARCH_SMART_FILTER:
-                            cmd.append("--exclude-sizes=0B")
-                        elif wc_status := wildcard.get("status"):
-                            if wc_status != 200:
-                                cmd.extend(["--exclude-status", str(wc_status)])
-                            if wc_size := wildcard.get("size"):
-                                cmd.extend(["--exclude-lengths", str(wc_size)])
-
-                    elif cfg["name"] == "Gobuster":
+                    continue
+
+                # ZMIANA: Pobranie globalnego UA (może być custom) - jeden na URL
+                current_ua = user_agent_rotator.get()
+                # Przygotowanie fragmentu nazwy pliku JSON
+                sanitized_target = _sanitize_target_for_filename(v_url)
+
+                for cfg in enabled_configs:
+                    json_output_file = None  # Plik JSON dla narzędzi wspierających
+                    if cfg["json_output"]:
                         # ENTERPRISE: JSON output dla precyzyjnego parsowania
                         json_output_file = os.path.join(
                             phase3_dir,
-                            f"gobuster_{sanitized_target}_{uuid.uuid4().hex[:8]}.json",
+                            f"{cfg['name'].lower()}_{sanitized_target}"
+                            f"_{uuid.uuid4().hex[:8]}.json",
                         )
-                        cmd.extend(["-w", wordlist, "-t", threads, "-k", "-u", v_url])
-                        cmd.extend(
-                            ["-o", json_output_file, "--no-error"]
-                        )  # Output file
-                        # Gobuster dir mode: dodaj -q dla quiet i parsuj z pliku
-                        if config.SAFE_MODE:
-                            cmd.extend(["--delay", "1500ms"])
-
-                        cmd.extend(["-a", current_ua])
-
-                        wc_status = wildcard.get("status")
-                        if wc_status and wc_status != 404:
-                            cmd.extend(["-b", str(wc_status)])
-
-                    future = executor.submit(
-                        _run_and_parse_dir_tool,
+                    # Do szablonu dokładamy tylko flagi zależne od URL
+                    cmd = _URL_CMD_BUILDERS[cfg["name"]](
+                        cfg["tpl"], v_url, wildcard, current_ua, json_output_file
+                    )
+
+                    scheduler.add(
+                        wildcard_host,
+                        url,
                         cfg["name"],
                         cmd,
                         v_url,
-                        config.TOOL_TIMEOUT_SECONDS,
+                        tool_timeout,
                         json_output_file,  # Przekazanie ścieżki JSON
                     )
-                    futures_map[future] = url
-
-            for future in as_completed(futures_map):
-                url_target = futures_map[future]
-                host_target = "/".join(url_target.split("/")[:3])
-
-                # Użyj nazwy `check_monitor` aby uniknąć konfliktu z `monitor` z definicji klasy
-                check_monitor = waf_monitors.get(host_target)
-                if check_monitor and check_monitor.is_blocked_event.is_set():
-                    action = _handle_waf_block_detection(executor, futures_map)
-                    if action == "stop":
-                        break
+
+            # Hosty, dla których blokada została już obsłużona (pytamy raz)
+            blocked_hosts: Set[str] = set()
+            for url_target, future in scheduler.completed():
+                host_target = host_of[url_target]
+
+                if host_target not in blocked_hosts:
+                    # Użyj nazwy `check_monitor` aby uniknąć konfliktu z `monitor` z definicji klasy
+                    check_monitor = waf_monitors.get(host_target)
+                    if check_monitor and check_monitor.is_blocked_event.is_set():
+                        blocked_hosts.add(host_target)
+                        action = _handle_waf_block_detection(executor)
+                        if action == "stop":
+                            break
                 try:
                     tool_name, tool_results = future.result()
-                    results_by_tool[tool_name].extend(tool_results)
+                    results_by_tool[tool_name].update(tool_results)
                 except Exception as e:
                     utils.log_and_echo(f"Błąd w wątku Fazy 3: {e}", "ERROR")
                 if progress_obj and main_task_id is not None:
@@ -615,35 +1040,30 @@ def start_dir_search(
             if m_val:
                 m_val.stop()
 
-    all_found_urls = {url for url_list in results_by_tool.values() for url in url_list}
+    all_found_urls: Set[str] = set().union(*results_by_tool.values())
+    sorted_urls = sorted(all_found_urls)
     final_results = {
-        "results_by_tool": results_by_tool,
-        "all_dirsearch_results": sorted(list(all_found_urls)),
+        "results_by_tool": {
+            tool: sorted(tool_urls) for tool, tool_urls in results_by_tool.items()
+        },
+        "all_dirsearch_results": sorted_urls,
     }
 
     verified_data = []
     if all_found_urls:
         msg = "[cyan]Weryfikuję URL-e (HTTPX)...[/cyan]"
         utils.console.print(Align.center(msg))
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            dir=config.REPORT_DIR,
-            suffix=".txt",
-            prefix="p3_",
-        ) as temp_f:
-            temp_f.write("\n".join(all_found_urls))
-            temp_file_path = temp_f.name
-        config.TEMP_FILES_TO_CLEAN.append(temp_file_path)
-
         httpx_output_file = os.path.join(config.REPORT_DIR, "httpx_results_phase3.txt")
+        # Lista URL-i trafia do httpx przez STDIN - bez pliku tymczasowego
         httpx_command = [
             "httpx",
-            "-l",
-            temp_file_path,
             "-silent",
+            "-nc",
             "-json",
             "-status-code",
+            # Filtr statusów po stronie httpx - mniej linii JSON do parsowania
+            "-mc",
+            _HTTPX_MATCH_CODES_P3,
         ]
 
         # ZMIANA: Zawsze ustawiaj UA, nawet jeśli nie Safe Mode
@@ -660,22 +1080,27 @@ def start_dir_search(
             httpx_command,
             httpx_output_file,
             config.TOOL_TIMEOUT_SECONDS,
+            input_data="\n".join(sorted_urls) + "\n",
         )
 
         if httpx_result_file and os.path.exists(httpx_result_file):
-            with open(httpx_result_file, "r", encoding="utf-8") as f:
-                for line in f:
+            # Tryb binarny: orjson/json przyjmują bytes, bez warstwy tekstowej
+            with open(httpx_result_file, "rb") as f:
+                for raw_line in f:
+                    fields = _fast_extract_httpx_fields(raw_line)
+                    if fields:
+                        verified_data.append(
+                            {"url": fields[0], "status_code": fields[1]}
+                        )
+                        continue
                     try:
-                        data = json.loads(line)
-                        if "url" in data and "status_code" in data:
-                            verified_data.append(
-                                {
-                                    "url": data["url"],
-                                    "status_code": data["status_code"],
-                                }
-                            )
-                    except json.JSONDecodeError:
+                        data = _json_loads(raw_line)
+                    except ValueError:
                         continue
+                    v_url = data.get("url")
+                    status_code = data.get("status_code")
+                    if v_url and status_code is not None:
+                        verified_data.append({"url": v_url, "status_code": status_code})
 
     msg = (
         f"Faza 3: Znaleziono {len(all_found_urls)} URLi. "
@@ -11,7 +11,7 @@ import sys
 import tempfile
 import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import urllib3
 from rich.align import Align
@@ -40,7 +40,7 @@ LOG_COLOR_MAP = {
 }
 
 # --- Globalne zarządzanie procesami ---
-managed_processes: List[subprocess.Popen] = []
+managed_processes: Set[subprocess.Popen] = set()
 processes_lock = threading.Lock()
 
 # Import specyficzny dla systemu operacyjnego
@@ -68,7 +68,11 @@ else:
 
 # --- Centralna funkcja do uruchamiania narzędzi (ENTERPRISE GRADE) ---
 def execute_tool_command(
-    tool_name: str, command_parts: List[str], output_file: str, timeout: int
+    tool_name: str,
+    command_parts: List[str],
+    output_file: str,
+    timeout: int,
+    input_data: Optional[str] = None,
 ) -> Optional[str]:
     """
     Uruchamia zewnętrzne narzędzie, przechwytuje jego output i obsługuje błędy.
@@ -81,6 +85,7 @@ def execute_tool_command(
         command_parts: Lista argumentów polecenia.
         output_file: Ścieżka do pliku, gdzie zapisać stdout.
         timeout: Czas w sekundach, po którym proces zostanie przerwany.
+        input_data: Opcjonalne dane przekazywane na STDIN narzędzia.
 
     Returns:
         Ścieżka do pliku wyjściowego w przypadku sukcesu, None w przypadku błędu.
@@ -95,6 +100,7 @@ def execute_tool_command(
     try:
         process = subprocess.run(
             command_parts,
+            input=input_data,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             timeout=timeout,
@@ -681,7 +687,10 @@ def shuffle_wordlist(input_path: str, report_dir: str) -> Optional[str]:
         return None
 
 
-def get_random_browser_headers() -> List[str]:
+def get_random_browser_header_dict() -> Dict[str, str]:
+    """
+    Losowe nagłówki przeglądarki jako słownik (dla requests).
+    """
     accept = ["text/html", "application/json", "text/plain", "*/*"]
     languages = ["en-US", "en-GB", "de", "pl"]
     referers = [
@@ -691,16 +700,22 @@ def get_random_browser_headers() -> List[str]:
         "",
     ]
     session_id = "".join(random.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=32))
-    headers = [
-        f"Accept: {random.choice(accept)}",
-        f"Accept-Language: {random.choice(languages)}",
-        f"Referer: {random.choice(referers)}",
-        "Upgrade-Insecure-Requests: 1",
-        "DNT: 1",
-        "Cache-Control: max-age=0",
-        f"Cookie: sessionid={session_id}",
-    ]
-    return headers
+    return {
+        "Accept": random.choice(accept),
+        "Accept-Language": random.choice(languages),
+        "Referer": random.choice(referers),
+        "Upgrade-Insecure-Requests": "1",
+        "DNT": "1",
+        "Cache-Control": "max-age=0",
+        "Cookie": f"sessionid={session_id}",
+    }
+
+
+def get_random_browser_headers() -> List[str]:
+    """
+    Losowe nagłówki przeglądarki jako lista "Nazwa: wartość" (dla flag -H).
+    """
+    return [f"{k}: {v}" for k, v in get_random_browser_header_dict().items()]
 
 
 def check_required_tools() -> List[str]: